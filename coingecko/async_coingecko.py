@@ -0,0 +1,232 @@
+"""Asynchronous CoinGecko API wrapper built on aiohttp.
+
+Web: https://www.coingecko.com/en
+Doc: https://www.coingecko.com/en/api/documentation
+"""
+import asyncio
+from typing import Any, Dict, List, Optional, Sequence
+
+import aiohttp
+
+from .coingecko import CoinGecko, Timeout
+from .utils import (
+    build_cache_key,
+    clean_params,
+    json_loads,
+    parse_error,
+)
+
+
+class AsyncCoinGecko(CoinGecko):
+    """Asynchronous CoinGecko API wrapper.
+
+    Every endpoint of :class:`CoinGecko` is available and returns a
+    coroutine, at most `concurrency` requests are in flight at once.
+    Retries mirror the sync client, `http_cache` is not supported.
+
+    Usage:
+        async with AsyncCoinGecko() as cg:
+            await cg.get_simple_price(ids=["bitcoin"], vs_currencies=["usd"])
+    """
+
+    __slots__ = (
+        "concurrency",
+        "max_retries",
+        "backoff_factor",
+        "status_forcelist",
+        "_sem",
+    )
+    BACKOFF_MAX = 120.0
+
+    def __init__(
+        self,
+        key: Optional[str] = None,
+        fail_silently: bool = False,
+        max_retries: int = 3,
+        backoff_factor: float = 1.0,
+        status_forcelist: Sequence[int] = CoinGecko.RETRY_STATUS_FORCELIST,
+        cache_ttl: Optional[float] = None,
+        cache_maxsize: int = CoinGecko.DEFAULT_CACHE_MAXSIZE,
+        concurrency: int = 64,
+        max_per_minute: Optional[int] = None,
+        timeout: Timeout = CoinGecko.DEFAULT_TIMEOUT,
+    ) -> None:
+        """Init the asynchronous CoinGecko API.
+
+        Args:
+            key (:obj:`str`, optional): CoinGecko API key.
+            fail_silently (:obj:`bool`, optional): If true an exception should
+                be raise in case of wrong status code. Defaults to False.
+            max_retries (:obj:`int`, optional): Number of retries on
+                transient errors. Defaults to 3.
+            backoff_factor (:obj:`float`, optional): Exponential backoff
+                factor between retries, in seconds. Defaults to 1.0.
+            status_forcelist (:obj:`list` of :obj:`int`, optional): Status
+                codes that should be retried. Defaults to 429 and 5xx.
+            cache_ttl (:obj:`float`, optional): Cache successful responses
+                for this many seconds, see `CACHE_TTLS` for per endpoint
+                overrides. Defaults to None (no cache).
+            cache_maxsize (:obj:`int`, optional): Maximum number of cached
+                responses, the least recently used are evicted first.
+                Defaults to 1024.
+            concurrency (:obj:`int`, optional): Maximum number of requests
+                in flight. Defaults to 64.
+            max_per_minute (:obj:`int`, optional): Throttle requests to stay
+                below this many calls per minute. Defaults to None (no limit).
+            timeout (:obj:`float` or :obj:`tuple`, optional): Request timeout
+                in seconds, or a (connect, read) tuple. Defaults to
+                (5.0, 15.0).
+        """
+        # the requests session of CoinGecko.__init__ is not needed here
+        self._init_state(
+            key=key,
+            fail_silently=fail_silently,
+            cache_ttl=cache_ttl,
+            cache_maxsize=cache_maxsize,
+            max_per_minute=max_per_minute,
+            timeout=timeout,
+        )
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.status_forcelist = status_forcelist
+        # created lazily, aiohttp sessions must be bound to a running loop
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._sem: Optional[asyncio.Semaphore] = None
+
+    def __enter__(self) -> None:
+        # the inherited sync context manager would never await close()
+        raise TypeError("use 'async with' instead")
+
+    async def __aenter__(self) -> "AsyncCoinGecko":
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Close the underlying HTTP session."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    @staticmethod
+    def _client_timeout(timeout: Timeout) -> aiohttp.ClientTimeout:
+        connect, read = (
+            timeout if isinstance(timeout, tuple) else (timeout, timeout)
+        )
+        return aiohttp.ClientTimeout(sock_connect=connect, sock_read=read)
+
+    def _retry_delay(self, attempt: int, retry_after: Optional[str]) -> float:
+        """Seconds to wait before retry number `attempt` (from 0)."""
+        if retry_after is not None:
+            try:
+                return max(float(retry_after), 0.0)
+            except ValueError:
+                # HTTP-date values are not supported
+                pass
+        return min(self.backoff_factor * 2**attempt, self.BACKOFF_MAX)
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None:
+            self._session = aiohttp.ClientSession(
+                # aiohttp negotiates accept-encoding from its own decoders
+                headers=dict(self._HEADERS),
+                timeout=self._client_timeout(self.timeout),
+                connector=aiohttp.TCPConnector(limit=256, limit_per_host=64),
+            )
+            self._sem = asyncio.Semaphore(self.concurrency)
+        return self._session
+
+    async def _get(
+        self,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        timeout: Optional[Timeout] = None,
+    ) -> Any:
+        """Get requests to the specified path on CoinGecko API.
+
+        `timeout` overrides the instance timeout for this call.
+        """
+        params = clean_params(params)
+
+        ttl = self._get_cache_ttl(path)
+        if ttl:
+            key = build_cache_key(path, params)
+            cached = self._cache_get(key, ttl)
+            if cached:
+                return cached[1]
+
+        session = self._get_session()
+        kwargs = {"timeout": self._client_timeout(timeout)} if timeout else {}
+        attempt = 0
+        while True:
+            if self._rate_limiter:
+                wait = self._rate_limiter.reserve()
+                if wait:
+                    await asyncio.sleep(wait)
+
+            try:
+                async with self._sem, session.get(
+                    self.BASE_URL + path, params=params, **kwargs
+                ) as r:
+                    if self._rate_limiter:
+                        self._rate_limiter.update(r.headers)
+                    if r.status == 200:
+                        data = json_loads(await r.read())
+                        if ttl:
+                            self._cache_set(key, data)
+                        return data
+
+                    text = await r.text()
+            except aiohttp.ClientConnectionError as e:
+                # timeouts are not retried, like the sync client
+                if attempt >= self.max_retries or isinstance(
+                    e, asyncio.TimeoutError
+                ):
+                    raise
+                retry_after = None
+            else:
+                if (
+                    attempt >= self.max_retries
+                    or r.status not in self.status_forcelist
+                ):
+                    break
+                retry_after = r.headers.get("retry-after")
+
+            await asyncio.sleep(self._retry_delay(attempt, retry_after))
+            attempt += 1
+
+        details = parse_error(r.headers.get("content-type", ""), text)
+        return self._on_error(
+            r, r.status, path, details, message=f"{r.status} {details}"
+        )
+
+    async def gather_prices(
+        self,
+        ids: List[str],
+        vs_currencies: List[str],
+        batch_size: int = 250,
+        **kwargs,
+    ) -> Dict[str, Any]:
+        """Get the price of many coins, splitting ids in concurrent batches.
+
+        Extra keyword arguments are passed to `get_simple_price`.
+        """
+        batches = [
+            ids[i : i + batch_size] for i in range(0, len(ids), batch_size)
+        ]
+        results = await asyncio.gather(
+            *(
+                self.get_simple_price(
+                    ids=batch, vs_currencies=vs_currencies, **kwargs
+                )
+                for batch in batches
+            )
+        )
+
+        prices: Dict[str, Any] = {}
+        for result in results:
+            if result:
+                prices.update(result)
+        return prices
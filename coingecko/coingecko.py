@@ -3,29 +3,50 @@
 Web: https://www.coingecko.com/en
 Doc: https://www.coingecko.com/en/api/documentation
 """
-import json
+import functools
 import logging
-from typing import Any, Dict, List, Optional
+import time
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Any, Dict, Optional, Sequence, Tuple, Union
 
 import requests
-
-from .utils import clean_params
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .endpoints import add_endpoints
+from .utils import (
+    TokenBucket,
+    build_cache_key,
+    clean_params,
+    json_loads,
+    parse_error,
+)
 
 logger = logging.getLogger(__name__)
 
+# seconds, either a single value or a (connect, read) tuple
+Timeout = Union[float, Tuple[float, float]]
+
 
 class CoinGeckoAPIError(Exception):
+    __slots__ = ("response", "message")
+
     def __init__(self, response, message=""):
         super().__init__(message)
         self.response = response
         self.message = message
 
+    def __reduce__(self):
+        # slots are not part of the default exception pickling state
+        return self.__class__, (self.response, self.message)
+
     def __str__(self):
-        # try just in case there is no json available
-        try:
-            content = self.response.json()["error"]
-        except json.JSONDecodeError:
-            content = self.response.content.decode()
+        if self.message:
+            return self.message
+        content = parse_error(
+            self.response.headers.get("content-type", ""), self.response.text
+        )
         return f"{self.response.status_code} {content}"
 
 
@@ -36,10 +57,51 @@ class CoinGecko:
     Doc: https://www.coingecko.com/en/api/documentation
     """
 
+    __slots__ = (
+        "key",
+        "fail_silently",
+        "cache_ttl",
+        "cache_maxsize",
+        "_cache",
+        "_rate_limiter",
+        "_session",
+        "timeout",
+    )
+
     BASE_URL = "https://api.coingecko.com/api/v3/"
+    # requests already negotiates accept-encoding (br when a decoder exists)
+    _HEADERS = MappingProxyType({"accept": "application/json"})
+    RETRY_STATUS_FORCELIST = (429, 500, 502, 503, 504)
+    DEFAULT_TIMEOUT = (5.0, 15.0)
+    DEFAULT_CACHE_MAXSIZE = 1024
+    # per endpoint TTL (seconds) overriding the default cache_ttl
+    CACHE_TTLS = {
+        "simple/supported_vs_currencies": 6 * 3600,
+        "coins/list": 6 * 3600,
+        "coins/categories/list": 6 * 3600,
+        "asset_platforms": 6 * 3600,
+        "exchanges/list": 6 * 3600,
+        "indexes/list": 6 * 3600,
+        "derivatives/exchanges/list": 6 * 3600,
+        "events/countries": 6 * 3600,
+        "events/types": 6 * 3600,
+        "simple/price": 30,
+        "coins/markets": 60,
+        "exchange_rates": 60,
+    }
 
     def __init__(
-        self, key: Optional[str] = None, fail_silently: bool = False
+        self,
+        key: Optional[str] = None,
+        fail_silently: bool = False,
+        max_retries: int = 3,
+        backoff_factor: float = 1.0,
+        status_forcelist: Sequence[int] = RETRY_STATUS_FORCELIST,
+        cache_ttl: Optional[float] = None,
+        cache_maxsize: int = DEFAULT_CACHE_MAXSIZE,
+        http_cache: Union[str, bool] = False,
+        max_per_minute: Optional[int] = None,
+        timeout: Timeout = DEFAULT_TIMEOUT,
     ) -> None:
         """Init the CoinGecko API.
 
@@ -47,495 +109,196 @@ class CoinGecko:
             key (:obj:`str`, optional): CoinGecko API key.
             fail_silently (:obj:`bool`, optional): If true an exception should
                 be raise in case of wrong status code. Defaults to False.
+            max_retries (:obj:`int`, optional): Number of retries on
+                transient errors. Defaults to 3.
+            backoff_factor (:obj:`float`, optional): Exponential backoff
+                factor between retries, in seconds. Defaults to 1.0.
+            status_forcelist (:obj:`list` of :obj:`int`, optional): Status
+                codes that should be retried. Defaults to 429 and 5xx.
+            cache_ttl (:obj:`float`, optional): Cache successful responses
+                for this many seconds, see `CACHE_TTLS` for per endpoint
+                overrides. Defaults to None (no cache).
+            cache_maxsize (:obj:`int`, optional): Maximum number of cached
+                responses, the least recently used are evicted first.
+                Defaults to 1024.
+            http_cache (:obj:`str` or :obj:`bool`, optional): Honor HTTP
+                caching headers (Cache-Control, ETag) using `cachecontrol`.
+                If a string is given it is used as a file cache directory,
+                otherwise responses are kept in memory. Defaults to False.
+            max_per_minute (:obj:`int`, optional): Throttle requests to stay
+                below this many calls per minute. Defaults to None (no limit).
+            timeout (:obj:`float` or :obj:`tuple`, optional): Request timeout
+                in seconds, or a (connect, read) tuple. Read timeouts are not
+                retried and raise `requests.Timeout`, connect timeouts are
+                retried up to `max_retries` times. Retries add the backoff
+                sleeps and any server Retry-After delay, so interactive
+                callers should use small `max_retries` and `backoff_factor`
+                as well. Defaults to (5.0, 15.0).
         """
+        self._init_state(
+            key=key,
+            fail_silently=fail_silently,
+            cache_ttl=cache_ttl,
+            cache_maxsize=cache_maxsize,
+            max_per_minute=max_per_minute,
+            timeout=timeout,
+        )
+        # keep a single session so connections are pooled between calls
+        self._session = requests.Session()
+        self._session.headers.update(self._HEADERS)
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=status_forcelist,
+            # read timeouts raise Timeout instead of a retried ConnectionError
+            read=False,
+            allowed_methods=frozenset(["GET"]),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = self._build_adapter(http_cache)(
+            pool_connections=10, pool_maxsize=20, max_retries=retry
+        )
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+
+    def _init_state(
+        self,
+        key: Optional[str],
+        fail_silently: bool,
+        cache_ttl: Optional[float],
+        cache_maxsize: int,
+        max_per_minute: Optional[int],
+        timeout: Timeout,
+    ) -> None:
+        """Set the state shared by the sync and async clients."""
         self.key = key
         self.fail_silently = fail_silently
+        self.cache_ttl = cache_ttl
+        self.cache_maxsize = cache_maxsize
+        self.timeout = timeout
+        self._cache: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._rate_limiter = (
+            TokenBucket(max_per_minute) if max_per_minute else None
+        )
 
-    def _get_headers(self) -> Dict[str, str]:
-        return {"accept": "application/json"}
+    @staticmethod
+    def _build_adapter(http_cache: Union[str, bool]):
+        """Return the adapter factory, HTTP caching aware if requested."""
+        if not http_cache:
+            return HTTPAdapter
+
+        try:
+            from cachecontrol import CacheControlAdapter
+            from cachecontrol.caches.file_cache import FileCache
+        except ImportError as e:
+            raise ImportError(
+                "http_cache requires cachecontrol, install it with "
+                "`pip install py-coingecko-client[cache]`"
+            ) from e
+
+        cache = FileCache(http_cache) if isinstance(http_cache, str) else None
+        # no heuristic, the server caching headers alone drive reuse
+        return functools.partial(CacheControlAdapter, cache=cache)
+
+    def __enter__(self) -> "CoinGecko":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the underlying HTTP session."""
+        self._session.close()
+
+    def clear_cache(self) -> None:
+        """Drop every cached response."""
+        self._cache.clear()
+
+    def _get_cache_ttl(self, path: str) -> Optional[float]:
+        if not self.cache_ttl:
+            return None
+        return self.CACHE_TTLS.get(path, self.cache_ttl)
+
+    def _cache_get(self, key: str, ttl: float) -> Optional[Tuple[float, Any]]:
+        cached = self._cache.get(key)
+        if cached is None:
+            return None
+        if time.monotonic() - cached[0] >= ttl:
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return cached
+
+    def _cache_set(self, key: str, data: Any) -> None:
+        self._cache[key] = (time.monotonic(), data)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_maxsize:
+            self._cache.popitem(last=False)
 
     def _get(
         self,
         path: str,
         params: Optional[Dict[str, Any]] = None,
+        timeout: Optional[Timeout] = None,
     ) -> Any:
-        """Get requests to the specified path on CoinGecko API."""
-        r = requests.get(
+        """Get requests to the specified path on CoinGecko API.
+
+        `timeout` overrides the instance timeout for this call.
+        """
+        params = clean_params(params)
+
+        ttl = self._get_cache_ttl(path)
+        if ttl:
+            key = build_cache_key(path, params)
+            cached = self._cache_get(key, ttl)
+            if cached:
+                return cached[1]
+
+        if self._rate_limiter:
+            self._rate_limiter.acquire()
+
+        r = self._session.get(
             url=self.BASE_URL + path,
-            params=clean_params(params),
-            headers=self._get_headers(),
+            params=params,
+            timeout=timeout or self.timeout,
         )
 
-        if r.status_code == 200:
-            return r.json()
+        if self._rate_limiter:
+            self._rate_limiter.update(r.headers)
 
-        details = r.content.decode()
-        try:
-            details = r.json()
-        except Exception:
-            pass
+        if r.status_code == 200:
+            data = json_loads(r.content)
+            if ttl:
+                self._cache_set(key, data)
+            return data
+
+        details = parse_error(r.headers.get("content-type", ""), r.text)
+        return self._on_error(
+            r,
+            r.status_code,
+            path,
+            details,
+            message=f"{r.status_code} {details}",
+        )
 
+    def _on_error(
+        self, r, status_code: int, path: str, details: Any, message: str = ""
+    ) -> None:
         if not self.fail_silently:
             logger.warning(
-                f"CoinGecko API error {r.status_code} on {path}: {details}"
+                f"CoinGecko API error {status_code} on {path}: {details}"
             )
-            self._fail(r)
+            self._fail(r, message)
         else:
             logger.info(
-                f"CoinGecko API silent error {r.status_code} on {path}: "
+                f"CoinGecko API silent error {status_code} on {path}: "
                 f"{details}"
             )
             return None
 
-    def _fail(self, r):
-        raise CoinGeckoAPIError(response=r)
-
-    def ping(self):
-        """Check API server status."""
-        return self._get("ping")
-
-    def get_simple_price(
-        self,
-        ids: List[str],
-        vs_currencies: List[str],
-        include_market_cap: Optional[bool] = None,
-        include_24hr_vol: Optional[bool] = None,
-        include_24hr_change: Optional[bool] = None,
-        include_last_updated_at: Optional[bool] = None,
-    ):
-        """Get the current price of any crypto in any supported currencies."""
-        return self._get(
-            "simple/price",
-            params={
-                "ids": ids,
-                "vs_currencies": vs_currencies,
-                "include_market_cap": include_market_cap,
-                "include_24hr_vol": include_24hr_vol,
-                "include_24hr_change": include_24hr_change,
-                "include_last_updated_at": include_last_updated_at,
-            },
-        )
-
-    def get_simple_token_price(
-        self,
-        id: str,
-        contract_addresses: List[str],
-        vs_currencies: List[str],
-        include_market_cap: Optional[bool] = None,
-        include_24hr_vol: Optional[bool] = None,
-        include_24hr_change: Optional[bool] = None,
-        include_last_updated_at: Optional[bool] = None,
-    ):
-        """Get current price of tokens."""
-        return self._get(
-            "simple/token_price/{id}",
-            params={
-                "contract_addresses": contract_addresses,
-                "vs_currencies": vs_currencies,
-                "include_market_cap": include_market_cap,
-                "include_24hr_vol": include_24hr_vol,
-                "include_24hr_change": include_24hr_change,
-                "include_last_updated_at": include_last_updated_at,
-            },
-        )
-
-    def get_simple_supported_vs_currencies(self):
-        """Get list of supported_vs_currencies."""
-        return self._get("simple/supported_vs_currencies")
-
-    def get_coins_list(self, include_platform: Optional[bool] = None):
-        """Use this to obtain all the coins' id in order to make API calls."""
-        return self._get(
-            "coins/list",
-            params={"include_platform": str(include_platform).lower()},
-        )
-
-    def get_coins_markets(
-        self,
-        vs_currency: str,
-        ids: Optional[List[str]] = None,
-        category: Optional[str] = None,
-        order: Optional[str] = None,
-        per_page: Optional[int] = None,
-        page: Optional[int] = None,
-        sparkline: Optional[bool] = None,
-        price_change_percentage: Optional[List[str]] = None,
-    ):
-        """Use this to obtain all the coins market data."""
-        return self._get(
-            "coins/markets",
-            params={
-                "vs_currency": vs_currency,
-                "ids": ids,
-                "category": category,
-                "order": order,
-                "per_page": per_page,
-                "page": page,
-                "sparkline": sparkline,
-                "price_change_percentage": price_change_percentage,
-            },
-        )
-
-    def get_coin_by_id(
-        self,
-        id: str,
-        localization: Optional[bool] = False,
-        tickers: Optional[bool] = False,
-        market_data: Optional[bool] = None,
-        community_data: Optional[bool] = None,
-        developer_data: Optional[bool] = None,
-        sparkline: Optional[bool] = None,
-    ):
-        """Get current data for a coin."""
-        return self._get(
-            f"coins/{id}",
-            params={
-                "localization": localization,
-                "tickers": tickers,
-                "market_data": market_data,
-                "community_data": community_data,
-                "developer_data": developer_data,
-                "sparkline": sparkline,
-            },
-        )
-
-    def get_coin_tickers(
-        self,
-        id: str,
-        exchange_ids: Optional[str] = None,
-        include_exchange_logo: Optional[str] = None,
-        page: Optional[int] = None,
-        order: Optional[str] = None,
-        depth: Optional[str] = None,
-    ):
-        """Get coin tickers."""
-        return self._get(
-            f"coins/{id}/tickers",
-            params={
-                "exchange_ids": exchange_ids,
-                "include_exchange_logo": include_exchange_logo,
-                "page": page,
-                "order": order,
-                "depth": depth,
-            },
-        )
-
-    def get_coin_history(
-        self,
-        id: str,
-        date: str,
-        localization: Optional[str] = None,
-    ):
-        """Get historical data."""
-        return self._get(
-            f"coins/{id}/history",
-            params={
-                "date": date,
-                "localization": localization,
-            },
-        )
-
-    def get_coin_market_chart(
-        self,
-        id: str,
-        vs_currency: str,
-        days: str,
-        interval: Optional[str] = None,
-    ):
-        """Get historical market data."""
-        return self._get(
-            f"coins/{id}/market_chart",
-            params={
-                "vs_currency": vs_currency,
-                "days": days,
-                "interval": interval,
-            },
-        )
-
-    def get_coin_market_chart_range(
-        self,
-        id: str,
-        vs_currency: str,
-        from_param: str,
-        to: str,
-    ):
-        """Get historical market data."""
-        return self._get(
-            f"coins/{id}/market_chart/range",
-            params={
-                "vs_currency": vs_currency,
-                "from": from_param,
-                "to": to,
-            },
-        )
-
-    def get_coin_status_updates(
-        self,
-        id: str,
-        per_page: Optional[int] = None,
-        page: Optional[int] = None,
-    ):
-        """Get status updates for a given coin."""
-        return self._get(
-            f"coins/{id}/market_chart/range",
-            params={
-                "per_page": per_page,
-                "page": page,
-            },
-        )
-
-    def get_coin_ohlc(
-        self,
-        id: str,
-        vs_currency: str,
-        days: str,
-    ):
-        """Get coin's OHLC."""
-        return self._get(
-            f"coins/{id}/ohlc",
-            params={
-                "vs_currency": vs_currency,
-                "days": days,
-            },
-        )
-
-    def get_coin_contract(self, id: str, contract_address: str):
-        """Get coin info from contract address."""
-        return self._get(f"coins/{id}/contract/{contract_address}")
-
-    def get_coin_contract_market_chart(
-        self,
-        id: str,
-        contract_address: str,
-        vs_currency: str,
-        days: str,
-    ):
-        """Get historical market data include."""
-        return self._get(
-            f"coins/{id}/contract/{contract_address}/market_chart/",
-            params={
-                "vs_currency": vs_currency,
-                "days": days,
-            },
-        )
-
-    def get_coin_contract_market_chart_range(
-        self,
-        id: str,
-        contract_address: str,
-        vs_currency: str,
-        from_param: int,
-        to: int,
-    ):
-        """Get historical market data include."""
-        return self._get(
-            f"coins/{id}/contract/{contract_address}/market_chart/",
-            params={
-                "vs_currency": vs_currency,
-                "from": from_param,
-                "to": to,
-            },
-        )
-
-    def get_asset_platforms(self):
-        """List all asset platforms."""
-        return self._get("asset_platforms")
-
-    def get_coin_categories_list(self):
-        """List all categories."""
-        return self._get("coins/categories/list")
-
-    def get_coin_categories(self):
-        """List all categories with market data."""
-        return self._get("coins/categories")
-
-    def get_exchanges(self):
-        """List all exchanges."""
-        return self._get("exchanges")
-
-    def get_exchanges_list(self):
-        """List all supported markets id and name."""
-        return self._get("exchanges/list")
-
-    def get_exchange(self, id: str):
-        """Get exchange volume in BTC and tickers."""
-        return self._get("exchanges/{id}")
-
-    def get_exchange_tickets(
-        self,
-        id: str,
-        coin_ids: Optional[List[str]] = None,
-        include_exchange_logo: Optional[str] = None,
-        page: Optional[int] = None,
-        depth: Optional[str] = None,
-        order: Optional[str] = None,
-    ):
-        """Get exchange tickers (paginated)."""
-        return self._get(
-            "exchanges/{id}/tickers",
-            params={
-                "coin_ids": coin_ids,
-                "include_exchange_logo": include_exchange_logo,
-                "page": page,
-                "depth": depth,
-                "order": order,
-            },
-        )
-
-    def get_exchange_status_updates(
-        self,
-        id: str,
-        per_page: Optional[int] = None,
-        page: Optional[int] = None,
-    ):
-        """Get status updates for a given exchange."""
-        return self._get(
-            "exchanges/{id}/status_updates",
-            params={
-                "per_page": per_page,
-                "page": page,
-            },
-        )
-
-    def get_exchange_volume_chart(
-        self,
-        id: str,
-        days: int,
-    ):
-        """Get volume_chart data for a given exchange."""
-        return self._get(
-            "exchanges/{id}/volume_chart",
-            params={"days": days},
-        )
-
-    def get_finance_platforms(
-        self,
-        per_page: Optional[int] = None,
-        page: Optional[int] = None,
-    ):
-        """List all finance platforms."""
-        return self._get(
-            "finance_platforms",
-            params={"per_page": per_page, "page": page},
-        )
-
-    def get_finance_products(
-        self,
-        per_page: Optional[int] = None,
-        page: Optional[int] = None,
-        start_at: Optional[str] = None,
-        end_at: Optional[str] = None,
-    ):
-        """List all finance platforms."""
-        return self._get(
-            "finance_platforms",
-            params={
-                "per_page": per_page,
-                "page": page,
-                "start_at": start_at,
-                "end_at": end_at,
-            },
-        )
-
-    def get_indexes(self):
-        """List all market indexes."""
-        return self._get("indexes")
-
-    def get_indexes_by_market_id(self, market_id: str, id: str):
-        """Get market index by market id and index id."""
-        return self._get("indexes/{market_id}/{id}")
-
-    def get_indexes_list(self):
-        """List market indexes id and name."""
-        return self._get("indexes/list")
-
-    def get_derivatives(self):
-        """List all derivative tickers."""
-        return self._get("derivatives")
-
-    def get_derivatives_exchanges(self):
-        """List all derivative exchanges."""
-        return self._get("derivatives/exchanges")
-
-    def get_derivatives_exchange(
-        self,
-        id: str,
-        include_tickers: Optional[str] = None,
-    ):
-        """Show derivative exchange data."""
-        return self._get(
-            "derivatives/exchanges/{id}",
-            params={"include_tickers": include_tickers},
-        )
-
-    def get_derivatives_exchanges_list(self):
-        """List all derivative exchanges name and identifier."""
-        return self._get("derivatives/exchanges/list")
-
-    def get_status_updates(
-        self,
-        category: Optional[str] = None,
-        project_type: Optional[str] = None,
-        per_page: Optional[int] = None,
-        page: Optional[int] = None,
-    ):
-        """List all status_updates with data."""
-        return self._get(
-            "status_updates",
-            params={
-                "category": category,
-                "project_type": project_type,
-                "per_page": per_page,
-                "page": page,
-            },
-        )
-
-    def get_events(
-        self,
-        country_code: Optional[str] = None,
-        event_type: Optional[str] = None,
-        page: Optional[int] = None,
-        upcoming_events_only: Optional[str] = None,
-        from_date: Optional[str] = None,
-        to_date: Optional[str] = None,
-    ):
-        """Get events, paginated by 100."""
-        return self._get(
-            "events",
-            params={
-                "country_code": country_code,
-                "type": event_type,
-                "page": page,
-                "upcoming_events_only": upcoming_events_only,
-                "from_date": from_date,
-                "to_date": to_date,
-            },
-        )
-
-    def get_events_countries(self):
-        """Get list of event countries."""
-        return self._get("events/countries")
-
-    def get_events_types(self):
-        """Get list of event types."""
-        return self._get("events/types")
-
-    def get_events_exchange_rates(self):
-        """Get BTC-to-Currency exchange rates."""
-        return self._get("exchange_rates")
-
-    def get_search_trending(self):
-        """Top-7 trending coins on CoinGecko as searched by users last 24h."""
-        return self._get("search/trending")
-
-    def get_global(self):
-        """Get cryptocurrency global data."""
-        return self._get("global")
+    def _fail(self, r, message: str = ""):
+        raise CoinGeckoAPIError(response=r, message=message)
 
-    def get_global_decentralized_finance_defi(self):
-        """Get Top 100 Cryptocurrency Global Decentralized Finance data."""
-        return self._get("global/decentralized_finance_defi")
 
-    def get_companies(self, coin_id: str):
-        """Get public companies bitcoin or ethereum holdings."""
-        return self._get("companies/public_treasury/{coin_id}")
+add_endpoints(CoinGecko)
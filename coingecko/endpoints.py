@@ -0,0 +1,400 @@
+"""Declarative table of the CoinGecko API endpoints.
+
+Each entry is turned into a `CoinGecko` method by `add_endpoints`, path
+parameters (`{id}`) are formatted into the path and every other parameter is
+sent as a query string param.
+"""
+import inspect
+from string import Formatter
+from typing import Any, List, NamedTuple, Optional, Tuple
+
+REQUIRED = inspect.Parameter.empty
+
+
+class Param(NamedTuple):
+    name: str
+    annotation: Any
+    default: Any = REQUIRED
+    # query string name, when it differs from the python argument name
+    query: Optional[str] = None
+
+
+class Endpoint(NamedTuple):
+    name: str
+    path: str
+    doc: str
+    params: Tuple[Param, ...] = ()
+
+
+ID = Param("id", str)
+PER_PAGE = Param("per_page", Optional[int], None)
+PAGE = Param("page", Optional[int], None)
+
+ENDPOINTS = (
+    Endpoint("ping", "ping", "Check API server status."),
+    Endpoint(
+        "get_simple_price",
+        "simple/price",
+        "Get the current price of any crypto in any supported currencies.",
+        (
+            Param("ids", List[str]),
+            Param("vs_currencies", List[str]),
+            Param("include_market_cap", Optional[bool], None),
+            Param("include_24hr_vol", Optional[bool], None),
+            Param("include_24hr_change", Optional[bool], None),
+            Param("include_last_updated_at", Optional[bool], None),
+        ),
+    ),
+    Endpoint(
+        "get_simple_token_price",
+        "simple/token_price/{id}",
+        "Get current price of tokens.",
+        (
+            ID,
+            Param("contract_addresses", List[str]),
+            Param("vs_currencies", List[str]),
+            Param("include_market_cap", Optional[bool], None),
+            Param("include_24hr_vol", Optional[bool], None),
+            Param("include_24hr_change", Optional[bool], None),
+            Param("include_last_updated_at", Optional[bool], None),
+        ),
+    ),
+    Endpoint(
+        "get_simple_supported_vs_currencies",
+        "simple/supported_vs_currencies",
+        "Get list of supported_vs_currencies.",
+    ),
+    Endpoint(
+        "get_coins_list",
+        "coins/list",
+        "Use this to obtain all the coins' id in order to make API calls.",
+        (Param("include_platform", Optional[bool], None),),
+    ),
+    Endpoint(
+        "get_coins_markets",
+        "coins/markets",
+        "Use this to obtain all the coins market data.",
+        (
+            Param("vs_currency", str),
+            Param("ids", Optional[List[str]], None),
+            Param("category", Optional[str], None),
+            Param("order", Optional[str], None),
+            Param("per_page", Optional[int], None),
+            Param("page", Optional[int], None),
+            Param("sparkline", Optional[bool], None),
+            Param("price_change_percentage", Optional[List[str]], None),
+        ),
+    ),
+    Endpoint(
+        "get_coin_by_id",
+        "coins/{id}",
+        "Get current data for a coin.",
+        (
+            ID,
+            Param("localization", Optional[bool], False),
+            Param("tickers", Optional[bool], False),
+            Param("market_data", Optional[bool], None),
+            Param("community_data", Optional[bool], None),
+            Param("developer_data", Optional[bool], None),
+            Param("sparkline", Optional[bool], None),
+        ),
+    ),
+    Endpoint(
+        "get_coin_tickers",
+        "coins/{id}/tickers",
+        "Get coin tickers.",
+        (
+            ID,
+            Param("exchange_ids", Optional[str], None),
+            Param("include_exchange_logo", Optional[str], None),
+            PAGE,
+            Param("order", Optional[str], None),
+            Param("depth", Optional[str], None),
+        ),
+    ),
+    Endpoint(
+        "get_coin_history",
+        "coins/{id}/history",
+        "Get historical data.",
+        (
+            ID,
+            Param("date", str),
+            Param("localization", Optional[str], None),
+        ),
+    ),
+    Endpoint(
+        "get_coin_market_chart",
+        "coins/{id}/market_chart",
+        "Get historical market data.",
+        (
+            ID,
+            Param("vs_currency", str),
+            Param("days", str),
+            Param("interval", Optional[str], None),
+        ),
+    ),
+    Endpoint(
+        "get_coin_market_chart_range",
+        "coins/{id}/market_chart/range",
+        "Get historical market data.",
+        (
+            ID,
+            Param("vs_currency", str),
+            Param("from_param", str, query="from"),
+            Param("to", str),
+        ),
+    ),
+    Endpoint(
+        "get_coin_status_updates",
+        "coins/{id}/status_updates",
+        "Get status updates for a given coin.",
+        (ID, PER_PAGE, PAGE),
+    ),
+    Endpoint(
+        "get_coin_ohlc",
+        "coins/{id}/ohlc",
+        "Get coin's OHLC.",
+        (ID, Param("vs_currency", str), Param("days", str)),
+    ),
+    Endpoint(
+        "get_coin_contract",
+        "coins/{id}/contract/{contract_address}",
+        "Get coin info from contract address.",
+        (ID, Param("contract_address", str)),
+    ),
+    Endpoint(
+        "get_coin_contract_market_chart",
+        "coins/{id}/contract/{contract_address}/market_chart/",
+        "Get historical market data include.",
+        (
+            ID,
+            Param("contract_address", str),
+            Param("vs_currency", str),
+            Param("days", str),
+        ),
+    ),
+    Endpoint(
+        "get_coin_contract_market_chart_range",
+        "coins/{id}/contract/{contract_address}/market_chart/range",
+        "Get historical market data include.",
+        (
+            ID,
+            Param("contract_address", str),
+            Param("vs_currency", str),
+            Param("from_param", int, query="from"),
+            Param("to", int),
+        ),
+    ),
+    Endpoint(
+        "get_asset_platforms", "asset_platforms", "List all asset platforms."
+    ),
+    Endpoint(
+        "get_coin_categories_list",
+        "coins/categories/list",
+        "List all categories.",
+    ),
+    Endpoint(
+        "get_coin_categories",
+        "coins/categories",
+        "List all categories with market data.",
+    ),
+    Endpoint("get_exchanges", "exchanges", "List all exchanges."),
+    Endpoint(
+        "get_exchanges_list",
+        "exchanges/list",
+        "List all supported markets id and name.",
+    ),
+    Endpoint(
+        "get_exchange",
+        "exchanges/{id}",
+        "Get exchange volume in BTC and tickers.",
+        (ID,),
+    ),
+    Endpoint(
+        "get_exchange_tickets",
+        "exchanges/{id}/tickers",
+        "Get exchange tickers (paginated).",
+        (
+            ID,
+            Param("coin_ids", Optional[List[str]], None),
+            Param("include_exchange_logo", Optional[str], None),
+            PAGE,
+            Param("depth", Optional[str], None),
+            Param("order", Optional[str], None),
+        ),
+    ),
+    Endpoint(
+        "get_exchange_status_updates",
+        "exchanges/{id}/status_updates",
+        "Get status updates for a given exchange.",
+        (ID, PER_PAGE, PAGE),
+    ),
+    Endpoint(
+        "get_exchange_volume_chart",
+        "exchanges/{id}/volume_chart",
+        "Get volume_chart data for a given exchange.",
+        (ID, Param("days", int)),
+    ),
+    Endpoint(
+        "get_finance_platforms",
+        "finance_platforms",
+        "List all finance platforms.",
+        (PER_PAGE, PAGE),
+    ),
+    Endpoint(
+        "get_finance_products",
+        "finance_products",
+        "List all finance products.",
+        (
+            PER_PAGE,
+            PAGE,
+            Param("start_at", Optional[str], None),
+            Param("end_at", Optional[str], None),
+        ),
+    ),
+    Endpoint("get_indexes", "indexes", "List all market indexes."),
+    Endpoint(
+        "get_indexes_by_market_id",
+        "indexes/{market_id}/{id}",
+        "Get market index by market id and index id.",
+        (Param("market_id", str), ID),
+    ),
+    Endpoint(
+        "get_indexes_list", "indexes/list", "List market indexes id and name."
+    ),
+    Endpoint("get_derivatives", "derivatives", "List all derivative tickers."),
+    Endpoint(
+        "get_derivatives_exchanges",
+        "derivatives/exchanges",
+        "List all derivative exchanges.",
+    ),
+    Endpoint(
+        "get_derivatives_exchange",
+        "derivatives/exchanges/{id}",
+        "Show derivative exchange data.",
+        (ID, Param("include_tickers", Optional[str], None)),
+    ),
+    Endpoint(
+        "get_derivatives_exchanges_list",
+        "derivatives/exchanges/list",
+        "List all derivative exchanges name and identifier.",
+    ),
+    Endpoint(
+        "get_status_updates",
+        "status_updates",
+        "List all status_updates with data.",
+        (
+            Param("category", Optional[str], None),
+            Param("project_type", Optional[str], None),
+            PER_PAGE,
+            PAGE,
+        ),
+    ),
+    Endpoint(
+        "get_events",
+        "events",
+        "Get events, paginated by 100.",
+        (
+            Param("country_code", Optional[str], None),
+            Param("event_type", Optional[str], None, query="type"),
+            PAGE,
+            Param("upcoming_events_only", Optional[str], None),
+            Param("from_date", Optional[str], None),
+            Param("to_date", Optional[str], None),
+        ),
+    ),
+    Endpoint(
+        "get_events_countries",
+        "events/countries",
+        "Get list of event countries.",
+    ),
+    Endpoint("get_events_types", "events/types", "Get list of event types."),
+    Endpoint(
+        "get_events_exchange_rates",
+        "exchange_rates",
+        "Get BTC-to-Currency exchange rates.",
+    ),
+    Endpoint(
+        "get_search_trending",
+        "search/trending",
+        "Top-7 trending coins on CoinGecko as searched by users last 24h.",
+    ),
+    Endpoint("get_global", "global", "Get cryptocurrency global data."),
+    Endpoint(
+        "get_global_decentralized_finance_defi",
+        "global/decentralized_finance_defi",
+        "Get Top 100 Cryptocurrency Global Decentralized Finance data.",
+    ),
+    Endpoint(
+        "get_companies",
+        "companies/public_treasury/{coin_id}",
+        "Get public companies bitcoin or ethereum holdings.",
+        (Param("coin_id", str),),
+    ),
+)
+
+
+def _endpoint_source(endpoint: Endpoint, defaults: List[Any]) -> str:
+    """Return the source of the method calling `_get` for an endpoint."""
+    path_names = {
+        field for _, field, _, _ in Formatter().parse(endpoint.path) if field
+    }
+
+    args = ["self"]
+    for param in endpoint.params:
+        if param.default is REQUIRED:
+            args.append(param.name)
+        else:
+            args.append(f"{param.name}=_defaults[{len(defaults)}]")
+            defaults.append(param.default)
+
+    call = "f" + repr(endpoint.path) if path_names else repr(endpoint.path)
+    query = [
+        f"{param.query or param.name!r}: {param.name}"
+        for param in endpoint.params
+        if param.name not in path_names
+    ]
+    if query:
+        call += ", params={" + ", ".join(query) + "}"
+
+    return (
+        f"def {endpoint.name}({', '.join(args)}):\n"
+        f"    return self._get({call})\n"
+    )
+
+
+def _endpoint_signature(endpoint: Endpoint) -> inspect.Signature:
+    return inspect.Signature(
+        [inspect.Parameter("self", inspect.Parameter.POSITIONAL_OR_KEYWORD)]
+        + [
+            inspect.Parameter(
+                param.name,
+                inspect.Parameter.POSITIONAL_OR_KEYWORD,
+                default=param.default,
+                annotation=param.annotation,
+            )
+            for param in endpoint.params
+        ]
+    )
+
+
+def add_endpoints(cls: type) -> None:
+    """Attach the `ENDPOINTS` methods to `cls`.
+
+    The methods are compiled once from generated source, so calls go through
+    the regular python argument binding.
+    """
+    defaults: List[Any] = []
+    source = "\n".join(
+        _endpoint_source(endpoint, defaults) for endpoint in ENDPOINTS
+    )
+    # __name__ gives the generated functions the right __module__
+    namespace = {"__name__": cls.__module__, "_defaults": defaults}
+    exec(compile(source, "<coingecko endpoints>", "exec"), namespace)
+
+    for endpoint in ENDPOINTS:
+        method = namespace[endpoint.name]
+        method.__qualname__ = f"{cls.__qualname__}.{endpoint.name}"
+        method.__doc__ = endpoint.doc
+        method.__signature__ = _endpoint_signature(endpoint)
+        setattr(cls, endpoint.name, method)
@@ -1,4 +1,17 @@
-from typing import Any, Dict, List, Optional, Union
+import json
+import threading
+import time
+from typing import Any, Dict, List, Mapping, Optional, Union
+from urllib.parse import urlencode
+
+try:
+    import orjson
+
+    json_loads = orjson.loads
+except ImportError:  # pragma: no cover
+    json_loads = json.loads
+
+_BOOL_STR = {True: "true", False: "false"}
 
 
 def remove_empty_dict_values(dic: Dict[str, Any]) -> Dict[str, Any]:
@@ -12,7 +25,7 @@ def clean_dict_values(dic: Dict[str, Any]) -> Dict[str, Any]:
 
         if isinstance(value, bool):
             # convert a boolean to a string
-            dic[key] = str(value).lower()
+            dic[key] = _BOOL_STR[value]
 
         elif isinstance(value, list):
             # convert a list to a string
@@ -22,9 +35,98 @@ def clean_dict_values(dic: Dict[str, Any]) -> Dict[str, Any]:
 
 
 def clean_params(params: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
-    """Clean requests params removing empty values."""
+    """Clean requests params removing empty values.
+
+    Single pass equivalent of `remove_empty_dict_values` followed by
+    `clean_dict_values`, it runs on every API call.
+    """
     if not params:
         return None
-    params = remove_empty_dict_values(params)
-    params = clean_dict_values(params)
-    return params
+    cleaned = {}
+    for key, value in params.items():
+        if value is None:
+            continue
+        if value.__class__ is bool:
+            cleaned[key] = _BOOL_STR[value]
+        elif isinstance(value, (list, tuple)):
+            cleaned[key] = ",".join(map(str, value))
+        else:
+            cleaned[key] = value
+    return cleaned
+
+
+def parse_error(content_type: str, text: str) -> str:
+    """Extract the error message from an API error response body."""
+    if "json" in content_type:
+        try:
+            return json_loads(text)["error"]
+        except (ValueError, KeyError, TypeError):
+            pass
+    return text
+
+
+def build_cache_key(path: str, params: Optional[Dict[str, Any]]) -> str:
+    """Build a canonical cache key from a path and its cleaned params."""
+    if not params:
+        return path
+    return path + "?" + urlencode(sorted(params.items()))
+
+
+class TokenBucket:
+    """Client side rate limiter allowing `max_per_minute` calls per minute.
+
+    Tokens may go negative, the debt is the time callers have to wait for.
+    The bucket is thread-safe, callers sleep outside of its lock.
+    """
+
+    __slots__ = ("capacity", "rate", "tokens", "last_refill", "_lock")
+
+    def __init__(self, max_per_minute: int) -> None:
+        self.capacity = float(max_per_minute)
+        self.rate = max_per_minute / 60.0
+        self.tokens = self.capacity
+        self.last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self.last_refill
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+        self.last_refill = now
+
+    def reserve(self) -> float:
+        """Take a token and return how long to wait before using it."""
+        with self._lock:
+            self._refill()
+            self.tokens -= 1
+            tokens = self.tokens
+        if tokens >= 0:
+            return 0.0
+        return -tokens / self.rate
+
+    def acquire(self) -> None:
+        """Take a token, sleeping until it is available."""
+        wait = self.reserve()
+        if wait:
+            time.sleep(wait)
+
+    def update(self, headers: Mapping[str, str]) -> None:
+        """Shrink the bucket from the server rate limit headers."""
+        limit = self.capacity
+        remaining = headers.get("x-ratelimit-remaining")
+        if remaining is not None:
+            try:
+                limit = min(limit, float(remaining))
+            except ValueError:
+                pass
+
+        retry_after = headers.get("retry-after")
+        if retry_after is not None:
+            try:
+                limit = min(limit, -float(retry_after) * self.rate)
+            except ValueError:
+                # HTTP-date values are not supported
+                pass
+
+        with self._lock:
+            self.tokens = min(self.tokens, limit)
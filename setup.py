@@ -23,4 +23,13 @@ setup(
     packages=["coingecko"],
     include_package_data=True,
     install_requires=["requests"],
+    extras_require={
+        "async": ["aiohttp"],
+        "cache": ["cachecontrol[filecache]"],
+        "fast": [
+            "orjson",
+            "brotli; platform_python_implementation == 'CPython'",
+            "brotlicffi; platform_python_implementation != 'CPython'",
+        ],
+    },
 )
@@ -0,0 +1,181 @@
+from unittest import IsolatedAsyncioTestCase, mock
+
+import aiohttp
+
+from coingecko.async_coingecko import AsyncCoinGecko
+
+
+def mock_response(status=200, content=b"", text=""):
+    response = mock.MagicMock(status=status, headers={})
+    response.read = mock.AsyncMock(return_value=content)
+    response.text = mock.AsyncMock(return_value=text)
+    response.__aenter__.return_value = response
+    return response
+
+
+class AsyncCoinGeckoTestCase(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.api = AsyncCoinGecko()
+
+    async def asyncTearDown(self):
+        await self.api.close()
+
+    async def test_get(self):
+        with mock.patch(
+            "aiohttp.ClientSession.get",
+            return_value=mock_response(content=b"{}"),
+        ) as mock_get:
+            self.assertEqual(await self.api._get("test"), {})
+        mock_get.assert_called_once_with(
+            "https://api.coingecko.com/api/v3/test", params=None
+        )
+
+    async def test_get_timeout(self):
+        with mock.patch(
+            "aiohttp.ClientSession.get",
+            return_value=mock_response(content=b"{}"),
+        ) as mock_get:
+            await self.api._get("test", timeout=2)
+        timeout = mock_get.call_args.kwargs["timeout"]
+        self.assertEqual((timeout.sock_connect, timeout.sock_read), (2, 2))
+        session_timeout = self.api._session.timeout
+        self.assertEqual(session_timeout.sock_connect, 5.0)
+        self.assertEqual(session_timeout.sock_read, 15.0)
+
+    async def test_session_headers(self):
+        headers = self.api._get_session().headers
+        self.assertEqual(headers["accept"], "application/json")
+        self.assertNotIn("accept-encoding", headers)
+
+    async def test_get_cached(self):
+        self.api.cache_ttl = 60
+        with mock.patch(
+            "aiohttp.ClientSession.get",
+            return_value=mock_response(content=b'{"foo": 1}'),
+        ) as mock_get:
+            await self.api._get("test")
+            self.assertEqual(await self.api._get("test"), {"foo": 1})
+        mock_get.assert_called_once()
+
+    @mock.patch("asyncio.sleep")
+    async def test_get_rate_limited(self, mock_sleep):
+        api = AsyncCoinGecko(max_per_minute=60)
+        api._rate_limiter.tokens = 0
+        with mock.patch(
+            "aiohttp.ClientSession.get",
+            return_value=mock_response(content=b"{}"),
+        ):
+            await api._get("test")
+        await api.close()
+        mock_sleep.assert_called_once()
+
+    @mock.patch("coingecko.coingecko.logger.warning")
+    async def test_get_404_status(self, mock_log):
+        response = mock_response(status=404, text='{"error": "Not Found"}')
+        response.headers = {"content-type": "application/json"}
+        with mock.patch("aiohttp.ClientSession.get", return_value=response):
+            with self.assertRaises(Exception) as context:
+                await self.api._get("test")
+        self.assertEqual("404 Not Found", str(context.exception))
+        mock_log.assert_called_once()
+
+    @mock.patch("coingecko.coingecko.logger.info")
+    async def test_get_404_status_fail_silently(self, mock_log):
+        self.api.fail_silently = True
+        response = mock_response(status=404, text="404 Not Found Message")
+        with mock.patch("aiohttp.ClientSession.get", return_value=response):
+            self.assertEqual(await self.api._get("test"), None)
+        mock_log.assert_called_once()
+
+    @mock.patch("asyncio.sleep")
+    async def test_get_retry(self, mock_sleep):
+        busy = mock_response(status=429)
+        busy.headers = {"retry-after": "7"}
+        with mock.patch(
+            "aiohttp.ClientSession.get",
+            side_effect=[
+                busy,
+                mock_response(status=503),
+                mock_response(content=b"{}"),
+            ],
+        ) as mock_get:
+            self.assertEqual(await self.api._get("test"), {})
+        self.assertEqual(mock_get.call_count, 3)
+        self.assertEqual(
+            mock_sleep.call_args_list, [mock.call(7.0), mock.call(2.0)]
+        )
+
+    @mock.patch("asyncio.sleep")
+    @mock.patch("coingecko.coingecko.logger.warning")
+    async def test_get_retry_exhausted(self, mock_log, mock_sleep):
+        api = AsyncCoinGecko(max_retries=1)
+        with mock.patch(
+            "aiohttp.ClientSession.get",
+            return_value=mock_response(status=503, text="busy"),
+        ) as mock_get:
+            with self.assertRaises(Exception):
+                await api._get("test")
+        await api.close()
+        self.assertEqual(mock_get.call_count, 2)
+        mock_sleep.assert_called_once_with(1.0)
+
+    @mock.patch("asyncio.sleep")
+    async def test_get_retry_connection_error(self, mock_sleep):
+        api = AsyncCoinGecko(max_retries=1)
+        with mock.patch(
+            "aiohttp.ClientSession.get",
+            side_effect=aiohttp.ClientConnectionError,
+        ) as mock_get:
+            with self.assertRaises(aiohttp.ClientConnectionError):
+                await api._get("test")
+        await api.close()
+        self.assertEqual(mock_get.call_count, 2)
+
+    async def test_get_timeout_not_retried(self):
+        with mock.patch(
+            "aiohttp.ClientSession.get",
+            side_effect=aiohttp.ServerTimeoutError,
+        ) as mock_get:
+            with self.assertRaises(aiohttp.ServerTimeoutError):
+                await self.api._get("test")
+        mock_get.assert_called_once()
+
+    async def test_retry_delay(self):
+        self.assertEqual(self.api._retry_delay(0, "3"), 3.0)
+        self.assertEqual(self.api._retry_delay(1, "Wed, 21 Oct 2015"), 2.0)
+        self.assertEqual(self.api._retry_delay(10, None), 120.0)
+
+    async def test_sync_context_manager(self):
+        with self.assertRaises(TypeError):
+            with self.api:
+                pass  # pragma: no cover
+
+    async def test_shared_state(self):
+        api = AsyncCoinGecko(key="foo", cache_ttl=10, max_per_minute=30)
+        self.assertEqual(api.key, "foo")
+        self.assertEqual(api.cache_ttl, 10)
+        self.assertEqual(api._cache, {})
+        self.assertEqual(api._rate_limiter.capacity, 30)
+
+    async def test_slots(self):
+        self.assertFalse(hasattr(self.api, "__dict__"))
+
+    async def test_context_manager(self):
+        async with AsyncCoinGecko() as api:
+            api._get_session()
+        self.assertIsNone(api._session)
+
+    @mock.patch("coingecko.async_coingecko.AsyncCoinGecko._get")
+    async def test_get_simple_price(self, mock_get):
+        mock_get.return_value = {}
+        await self.api.get_simple_price(ids=["bitcoin"], vs_currencies=["usd"])
+        mock_get.assert_called_once()
+
+    @mock.patch("coingecko.async_coingecko.AsyncCoinGecko._get")
+    async def test_gather_prices(self, mock_get):
+        mock_get.side_effect = [{"a": 1, "b": 2}, {"c": 3}]
+        prices = await self.api.gather_prices(
+            ids=["a", "b", "c"], vs_currencies=["usd"], batch_size=2
+        )
+        self.assertEqual(prices, {"a": 1, "b": 2, "c": 3})
+        self.assertEqual(mock_get.call_count, 2)
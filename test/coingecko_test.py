@@ -1,35 +1,189 @@
-import json
+import collections
+import http.server
+import inspect
+import pickle
+import threading
 from unittest import TestCase, mock
 
-from coingecko.coingecko import CoinGecko
+from requests.adapters import HTTPAdapter
+
+from coingecko.coingecko import CoinGecko, CoinGeckoAPIError
 
 
 class CoinGeckoTestCase(TestCase):
     def setUp(self):
         self.api = CoinGecko()
 
-    def test_get_headers(self):
-        headers = self.api._get_headers()
-        self.assertIsNotNone(headers["accept"])
+    def test_headers(self):
+        self.assertEqual(CoinGecko._HEADERS["accept"], "application/json")
+        with self.assertRaises(TypeError):
+            CoinGecko._HEADERS["accept"] = "text/html"
+
+    def test_session_headers(self):
+        self.assertEqual(
+            self.api._session.headers["accept"], "application/json"
+        )
+
+    def test_retry_config(self):
+        api = CoinGecko(max_retries=5, backoff_factor=0.5)
+        retry = api._session.get_adapter(api.BASE_URL).max_retries
+        self.assertEqual(retry.total, 5)
+        self.assertEqual(retry.backoff_factor, 0.5)
+        self.assertIn(429, retry.status_forcelist)
+        self.assertIs(retry.read, False)
+
+    def test_http_cache(self):
+        from cachecontrol import CacheControlAdapter
+
+        api = CoinGecko(http_cache=True)
+        adapter = api._session.get_adapter(api.BASE_URL)
+        self.assertIsInstance(adapter, CacheControlAdapter)
+        self.assertEqual(adapter.max_retries.total, 3)
+
+    def test_http_cache_honors_headers(self):
+        hits = collections.Counter()
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            cache_control = {
+                "/fresh": "max-age=60",
+                "/stale": "max-age=0",
+                "/no-store": "no-store",
+            }
+
+            def do_GET(self):
+                hits[self.path] += 1
+                self.send_response(200)
+                self.send_header("content-type", "application/json")
+                self.send_header("content-length", "2")
+                self.send_header("cache-control", self.cache_control[self.path])
+                self.end_headers()
+                self.wfile.write(b"{}")
+
+            def log_message(self, *args):
+                pass
+
+        server = http.server.HTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+
+        base_url = f"http://127.0.0.1:{server.server_port}/"
+        with mock.patch.object(CoinGecko, "BASE_URL", base_url):
+            with CoinGecko(http_cache=True) as api:
+                for path in ("fresh", "stale", "no-store"):
+                    api._get(path)
+                    api._get(path)
+
+        self.assertEqual(hits["/fresh"], 1)
+        self.assertEqual(hits["/stale"], 2)
+        self.assertEqual(hits["/no-store"], 2)
+
+    @mock.patch.dict("sys.modules", {"cachecontrol": None})
+    def test_http_cache_not_installed(self):
+        with self.assertRaises(ImportError):
+            CoinGecko(http_cache=True)
+
+    def test_http_cache_disabled(self):
+        adapter = self.api._session.get_adapter(self.api.BASE_URL)
+        self.assertIs(type(adapter), HTTPAdapter)
+
+    @mock.patch("requests.Session.close")
+    def test_context_manager(self, mock_close):
+        with CoinGecko() as api:
+            self.assertIsInstance(api, CoinGecko)
+        mock_close.assert_called_once()
 
     @mock.patch(
-        "requests.get", return_value=mock.Mock(status_code=200, json=lambda: {})
+        "requests.Session.get",
+        return_value=mock.Mock(status_code=200, content=b"{}"),
     )
     def test_get(self, mock_get):
         self.api._get("test")
         mock_get.assert_called_once_with(
             url="https://api.coingecko.com/api/v3/test",
             params=None,
-            headers={"accept": "application/json"},
+            timeout=(5.0, 15.0),
         )
 
+    @mock.patch(
+        "requests.Session.get",
+        return_value=mock.Mock(status_code=200, content=b"{}"),
+    )
+    def test_get_timeout(self, mock_get):
+        api = CoinGecko(timeout=3)
+        api._get("test")
+        self.assertEqual(mock_get.call_args.kwargs["timeout"], 3)
+        api._get("test", timeout=(1, 2))
+        self.assertEqual(mock_get.call_args.kwargs["timeout"], (1, 2))
+
+    @mock.patch(
+        "requests.Session.get",
+        return_value=mock.Mock(status_code=200, content=b'{"foo": 1}'),
+    )
+    def test_get_cached(self, mock_get):
+        api = CoinGecko(cache_ttl=60)
+        self.assertEqual(api._get("test", params={"a": 1}), {"foo": 1})
+        self.assertEqual(api._get("test", params={"a": 1}), {"foo": 1})
+        mock_get.assert_called_once()
+        api._get("test", params={"a": 2})
+        self.assertEqual(mock_get.call_count, 2)
+        api.clear_cache()
+        api._get("test", params={"a": 1})
+        self.assertEqual(mock_get.call_count, 3)
+
+    @mock.patch(
+        "requests.Session.get",
+        return_value=mock.Mock(status_code=200, content=b"{}"),
+    )
+    def test_get_cache_maxsize(self, mock_get):
+        api = CoinGecko(cache_ttl=60, cache_maxsize=2)
+        api._get("a")
+        api._get("b")
+        api._get("a")  # hit, "b" becomes the least recently used
+        api._get("c")
+        self.assertEqual(list(api._cache), ["a", "c"])
+        self.assertEqual(mock_get.call_count, 3)
+
+    @mock.patch("coingecko.coingecko.time.monotonic")
+    @mock.patch(
+        "requests.Session.get",
+        return_value=mock.Mock(status_code=200, content=b"{}"),
+    )
+    def test_get_cache_expired(self, mock_get, mock_time):
+        api = CoinGecko(cache_ttl=60)
+        mock_time.return_value = 0
+        api._get("simple/price")
+        mock_time.return_value = 31
+        api._get("simple/price")
+        self.assertEqual(mock_get.call_count, 2)
+        api._get("test")
+        mock_time.return_value = 61
+        api._get("test")
+        self.assertEqual(mock_get.call_count, 3)
+        mock_time.return_value = 200
+        self.assertIsNone(api._cache_get("simple/price", 30))
+        self.assertNotIn("simple/price", api._cache)
+
+    @mock.patch("coingecko.utils.TokenBucket.acquire")
+    @mock.patch(
+        "requests.Session.get",
+        return_value=mock.Mock(
+            status_code=200, content=b"{}", headers={"retry-after": "1"}
+        ),
+    )
+    def test_get_rate_limited(self, mock_get, mock_acquire):
+        api = CoinGecko(max_per_minute=30)
+        api._get("test")
+        mock_acquire.assert_called_once()
+        self.assertLess(api._rate_limiter.tokens, 0)
+
     @mock.patch("coingecko.coingecko.logger.warning")
     @mock.patch(
-        "requests.get",
+        "requests.Session.get",
         return_value=mock.Mock(
             status_code=404,
-            json=lambda: {"error": "Not Found"},
-            content=b"404 Not Found Message",
+            headers={"content-type": "application/json; charset=utf-8"},
+            text='{"error": "Not Found"}',
         ),
     )
     def test_get_404_status(self, mock_get, mock_log):
@@ -43,11 +197,11 @@ class CoinGeckoTestCase(TestCase):
 
     @mock.patch("coingecko.coingecko.logger.info")
     @mock.patch(
-        "requests.get",
+        "requests.Session.get",
         return_value=mock.Mock(
             status_code=404,
-            json=mock.Mock(side_effect=Exception("")),
-            content=b"404 Not Found Message",
+            headers={"content-type": "text/html"},
+            text="404 Not Found Message",
         ),
     )
     def test_get_404_status_fail_silently(self, mock_get, mock_log):
@@ -55,13 +209,24 @@ class CoinGeckoTestCase(TestCase):
         self.assertEqual(self.api._get("test"), None)
         mock_log.assert_called_once()
 
+    def test_slots(self):
+        self.assertFalse(hasattr(self.api, "__dict__"))
+        with self.assertRaises(AttributeError):
+            self.api.foo = "bar"
+
+    def test_api_error_slots(self):
+        error = CoinGeckoAPIError(response="response", message="404 foo")
+        self.assertEqual(error.response, "response")
+        self.assertEqual(str(error), "404 foo")
+        error = pickle.loads(pickle.dumps(error))
+        self.assertEqual(error.response, "response")
+        self.assertEqual(error.message, "404 foo")
+
     def test_fail_with_no_json(self):
         response = mock.Mock(
             status_code=404,
-            content=b"Not Found Message Content",
-        )
-        response.json.side_effect = mock.Mock(
-            side_effect=json.JSONDecodeError("msg", "doc", 0)
+            headers={"content-type": "application/json"},
+            text="Not Found Message Content",
         )
         with self.assertRaises(Exception) as context:
             self.api._fail(response)
@@ -70,6 +235,62 @@ class CoinGeckoTestCase(TestCase):
             str(context.exception),
         )
 
+    def test_endpoint_signature(self):
+        signature = inspect.signature(CoinGecko.get_coin_by_id)
+        self.assertEqual(
+            list(signature.parameters)[:3], ["self", "id", "localization"]
+        )
+        self.assertIs(signature.parameters["localization"].default, False)
+        self.assertEqual(
+            CoinGecko.get_coin_by_id.__doc__, "Get current data for a coin."
+        )
+        self.assertEqual(
+            CoinGecko.get_coin_by_id.__module__, "coingecko.coingecko"
+        )
+        self.assertIs(
+            inspect.getmodule(CoinGecko.get_coin_by_id),
+            inspect.getmodule(CoinGecko),
+        )
+
+    @mock.patch("coingecko.coingecko.CoinGecko._get")
+    def test_endpoint_positional_args(self, mock_get):
+        self.api.get_coin_market_chart_range("bitcoin", "usd", 1, 2)
+        mock_get.assert_called_once_with(
+            "coins/bitcoin/market_chart/range",
+            params={"vs_currency": "usd", "from": 1, "to": 2},
+        )
+
+    @mock.patch(
+        "requests.Session.get",
+        return_value=mock.Mock(status_code=200, content=b"{}"),
+    )
+    def test_endpoint_base_url_override(self, mock_get):
+        class ProCoinGecko(CoinGecko):
+            BASE_URL = "https://pro-api.coingecko.com/api/v3/"
+
+        ProCoinGecko().get_global()
+        self.assertEqual(
+            mock_get.call_args.kwargs["url"],
+            "https://pro-api.coingecko.com/api/v3/global",
+        )
+        with mock.patch.object(CoinGecko, "BASE_URL", "https://pro/"):
+            self.api.ping()
+            self.assertEqual(
+                mock_get.call_args.kwargs["url"], "https://pro/ping"
+            )
+            self.api.get_exchange("x")
+            self.assertEqual(
+                mock_get.call_args.kwargs["url"], "https://pro/exchanges/x"
+            )
+
+    @mock.patch("coingecko.coingecko.CoinGecko._get")
+    def test_endpoint_missing_args(self, mock_get):
+        with self.assertRaises(TypeError):
+            self.api.get_coin_by_id()
+        with self.assertRaises(TypeError):
+            self.api.get_coin_by_id(id="bitcoin", foo="bar")
+        mock_get.assert_not_called()
+
     @mock.patch("coingecko.coingecko.CoinGecko._get")
     def test_ping(self, mock_get):
         self.api.ping()
@@ -97,7 +318,10 @@ class CoinGeckoTestCase(TestCase):
     @mock.patch("coingecko.coingecko.CoinGecko._get")
     def test_get_coins_list(self, mock_get):
         self.api.get_coins_list(include_platform=None)
-        mock_get.assert_called_once()
+        mock_get.assert_called_once_with(
+            "coins/list",
+            params={"include_platform": None},
+        )
 
     @mock.patch("coingecko.coingecko.CoinGecko._get")
     def test_get_coins_markets(self, mock_get):
@@ -194,7 +418,7 @@ class CoinGeckoTestCase(TestCase):
     @mock.patch("coingecko.coingecko.CoinGecko._get")
     def test_get_exchange(self, mock_get):
         self.api.get_exchange(id="bitcoin")
-        mock_get.assert_called_once()
+        mock_get.assert_called_once_with("exchanges/bitcoin")
 
     @mock.patch("coingecko.coingecko.CoinGecko._get")
     def test_get_exchange_tickets(self, mock_get):
@@ -230,8 +454,8 @@ class CoinGeckoTestCase(TestCase):
 
     @mock.patch("coingecko.coingecko.CoinGecko._get")
     def test_get_indexes_by_market_id(self, mock_get):
-        self.api.get_indexes_by_market_id(market_id="bitcoin", id="bitcoin")
-        mock_get.assert_called_once()
+        self.api.get_indexes_by_market_id(market_id="foo", id="bar")
+        mock_get.assert_called_once_with("indexes/foo/bar")
 
     @mock.patch("coingecko.coingecko.CoinGecko._get")
     def test_get_indexes_list(self, mock_get):
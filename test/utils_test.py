@@ -1,6 +1,13 @@
+import threading
+from unittest import mock
+
 from coingecko.utils import (
+    TokenBucket,
+    build_cache_key,
     clean_dict_values,
     clean_params,
+    json_loads,
+    parse_error,
     remove_empty_dict_values,
 )
 
@@ -28,6 +35,78 @@ def test_clean_params():
     assert new_dict["c"] == "true"
 
 
+def test_clean_params_tuple_and_false():
+    new_dict = clean_params({"a": ("foo", 1), "b": False, "c": 0})
+    assert new_dict == {"a": "foo,1", "b": "false", "c": 0}
+
+
 def test_clean_params_empty():
     new_dict = clean_params(None)
     assert new_dict is None
+
+
+def test_build_cache_key():
+    key = build_cache_key("simple/price", {"vs_currencies": "usd", "ids": "a"})
+    assert key == "simple/price?ids=a&vs_currencies=usd"
+
+
+def test_build_cache_key_no_params():
+    assert build_cache_key("ping", None) == "ping"
+
+
+@mock.patch("coingecko.utils.time.monotonic", return_value=0)
+def test_token_bucket(mock_time):
+    bucket = TokenBucket(max_per_minute=2)
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 30
+    mock_time.return_value = 90
+    assert bucket.reserve() == 0
+
+
+@mock.patch("coingecko.utils.time.sleep")
+@mock.patch("coingecko.utils.time.monotonic", return_value=0)
+def test_token_bucket_acquire(mock_time, mock_sleep):
+    bucket = TokenBucket(max_per_minute=1)
+    bucket.acquire()
+    mock_sleep.assert_not_called()
+    bucket.acquire()
+    mock_sleep.assert_called_once_with(60)
+
+
+@mock.patch("coingecko.utils.time.monotonic", return_value=0)
+def test_token_bucket_update(mock_time):
+    bucket = TokenBucket(max_per_minute=60)
+    bucket.update({"x-ratelimit-remaining": "0"})
+    assert bucket.tokens == 0
+    bucket.update({"retry-after": "5"})
+    assert bucket.reserve() == 6
+    bucket.update({"x-ratelimit-remaining": "foo", "retry-after": "bar"})
+    assert bucket.tokens == -6
+
+
+@mock.patch("coingecko.utils.time.monotonic", return_value=0)
+def test_token_bucket_threads(mock_time):
+    bucket = TokenBucket(max_per_minute=60)
+    threads = [
+        threading.Thread(target=lambda: [bucket.reserve() for _ in range(100)])
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert bucket.tokens == 60 - 800
+
+
+def test_json_loads():
+    assert json_loads(b'{"a": [1, true]}') == {"a": [1, True]}
+
+
+def test_parse_error():
+    assert parse_error("application/json", '{"error": "foo"}') == "foo"
+    assert parse_error("application/json", '{"status": "foo"}') == (
+        '{"status": "foo"}'
+    )
+    assert parse_error("application/json", "not json") == "not json"
+    assert parse_error("text/html", '{"error": "foo"}') == '{"error": "foo"}'